@@ -0,0 +1,148 @@
+import logging
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+from pathlib import Path
+
+DATA = Path(__file__).resolve().parents[1] / "data" / "processed"
+DATA_PATH = DATA / "demog_clean.csv"
+SNAPSHOT_PATH = DATA_PATH.with_suffix(".parquet")
+
+DTYPES = {
+    "region": "category",
+    "life_expectancy_total": "float64",
+    "life_expectancy_male": "float64",
+    "life_expectancy_female": "float64",
+    "total_deaths": "float64",
+    "under5_mortality": "float64",
+}
+
+# Límite por caché: regiones y columnas admiten combinaciones sin fin
+CACHE_MAX_ENTRIES = 64
+
+logger = logging.getLogger(__name__)
+
+# mkstemp crea con 0600; se lee la umask una vez para dar al snapshot permisos normales
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# ======================
+# LOAD DATA
+# ======================
+def read_snapshot():
+    try:
+        df = pd.read_parquet(SNAPSHOT_PATH, columns=list(DTYPES))
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Snapshot %s ilegible, se regenera: %s", SNAPSHOT_PATH, exc)
+        return None
+
+    if df.dtypes.astype(str).to_dict() != DTYPES:
+        logger.warning("Snapshot %s no coincide con DTYPES, se regenera", SNAPSHOT_PATH)
+        return None
+
+    return df
+
+def write_snapshot(df):
+    # Escritura atómica: un fallo a mitad nunca deja un parquet truncado
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=DATA, prefix=".demog_clean.", suffix=".parquet")
+        os.close(fd)
+        df.to_parquet(tmp, compression="zstd")
+        os.chmod(tmp, 0o666 & ~UMASK)
+        os.replace(tmp, SNAPSHOT_PATH)
+        tmp = None
+    except OSError as exc:
+        logger.warning("No se pudo escribir %s: %s", SNAPSHOT_PATH, exc)
+    finally:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+def read_processed():
+    # Snapshot parquet tipado; se regenera si el CSV es más reciente
+    if SNAPSHOT_PATH.exists() and SNAPSHOT_PATH.stat().st_mtime >= DATA_PATH.stat().st_mtime:
+        df = read_snapshot()
+        if df is not None:
+            return df
+
+    df = pd.read_csv(
+        DATA_PATH,
+        engine="pyarrow",
+        usecols=list(DTYPES),
+        dtype=DTYPES
+    )
+
+    write_snapshot(df)
+    return df
+
+@st.cache_resource
+def load_data():
+    df = read_processed()
+    return df, df.select_dtypes(include="number").columns.tolist()
+
+# ======================
+# FILTERS
+# ======================
+@st.cache_data
+def get_regions():
+    df, _ = load_data()
+    return df["region"].cat.categories.tolist()
+
+# Sin caché: la máscara por códigos es más barata que deserializar una copia
+def filter_by_regions(regions):
+    df, _ = load_data()
+    if not regions:
+        return df
+
+    region = df["region"].cat
+    # get_indexer marca con -1 las etiquetas desconocidas, igual que el código de NaN
+    idx = region.categories.get_indexer(regions)
+    mask = np.isin(region.codes.to_numpy(), idx[idx >= 0])
+    return df.iloc[mask]
+
+# ======================
+# CORRELATION
+# ======================
+def corr_matrix(X):
+    Xc = X - X.mean(axis=0)
+    # NumPy resuelve Xc.T @ Xc con syrk: solo calcula un triángulo y lo refleja
+    gram = Xc.T @ Xc
+    norms = np.sqrt(np.diag(gram))
+    corr = np.clip(gram / np.outer(norms, norms), -1, 1)
+    np.fill_diagonal(corr, 1)
+    return corr
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def compute_corr(regions, cols):
+    arr = filter_by_regions(regions)[list(cols)].to_numpy(dtype=np.float32)
+    arr = arr[~np.isnan(arr).any(axis=1)]
+    if len(arr) == 0:
+        return None
+
+    keep = np.flatnonzero(arr.max(axis=0) > arr.min(axis=0))
+    var_cols = [cols[i] for i in keep]
+
+    if len(var_cols) < 2:
+        return None
+
+    return pd.DataFrame(
+        corr_matrix(np.ascontiguousarray(arr[:, keep])),
+        index=var_cols,
+        columns=var_cols
+    )
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES)
+def build_corr_fig(regions, cols):
+    corr = compute_corr(regions, cols)
+    if corr is None:
+        return None
+
+    return px.imshow(
+        corr,
+        text_auto=".2f",
+        aspect="auto"
+    )
@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 from pathlib import Path
 
+from _helpers import build_corr_fig, filter_by_regions, get_regions, load_data
+
 # ======================
 # CONFIG
 # ======================
@@ -10,7 +11,8 @@ st.set_page_config(page_title="Life Expectancy Project", layout="wide")
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 ASSETS = BASE_DIR / "assets"
-DATA = BASE_DIR / "data" / "processed"
+
+MAX_SCATTER_POINTS = 50_000
 
 # ======================
 # HEADER
@@ -29,28 +31,21 @@ with col2:
     if header.exists():
         st.image(str(header), use_container_width=True)
 
-# ======================
-# LOAD DATA
-# ======================
-@st.cache_data
-def load_data():
-    return pd.read_csv(DATA / "demog_clean.csv")
-
-df = load_data()
-
 # ======================
 # SIDEBAR
 # ======================
 st.sidebar.header("Filtros")
 
-regions = sorted(df["region"].dropna().unique())
+regions = get_regions()
 selected_regions = st.sidebar.multiselect(
     "Selecciona regiones",
     regions,
     default=["Global"] if "Global" in regions else regions[:3]
 )
 
-df_f = df[df["region"].isin(selected_regions)] if selected_regions else df.copy()
+# Tupla ordenada: clave hashable y estable para la caché
+region_key = tuple(sorted(selected_regions))
+df_f = filter_by_regions(region_key)
 
 # ======================
 # RESUMEN
@@ -59,57 +54,63 @@ st.subheader("Resumen global")
 
 c1, c2, c3 = st.columns(3)
 
-c1.metric("Esperanza de vida media", round(df_f["life_expectancy_total"].mean(),2))
-c2.metric("Máxima esperanza de vida", round(df_f["life_expectancy_total"].max(),2))
-c3.metric("Mínima esperanza de vida", round(df_f["life_expectancy_total"].min(),2))
+stats = df_f["life_expectancy_total"].agg(["mean", "max", "min"])
+
+c1.metric("Esperanza de vida media", round(stats["mean"],2))
+c2.metric("Máxima esperanza de vida", round(stats["max"],2))
+c3.metric("Mínima esperanza de vida", round(stats["min"],2))
 
 # ======================
 # HEATMAP
 # ======================
 st.subheader("Correlación entre variables")
 
-num_cols = df_f.select_dtypes(include="number").columns.tolist()
-
-selected_cols = st.multiselect(
-    "Variables",
-    num_cols,
-    default=num_cols[:6]
-)
+_, num_cols = load_data()
 
-if len(selected_cols) >= 2:
+@st.fragment
+def heatmap_section(region_key, num_cols):
+    selected_cols = st.multiselect(
+        "Variables",
+        num_cols,
+        default=num_cols[:6]
+    )
 
-    tmp = df_f[selected_cols].dropna()
-    var_cols = [c for c in selected_cols if tmp[c].nunique() > 1]
+    if len(selected_cols) >= 2:
 
-    if len(var_cols) >= 2:
-        corr = tmp[var_cols].corr()
+        fig_corr = build_corr_fig(region_key, tuple(selected_cols))
 
-        fig_corr = px.imshow(
-            corr,
-            text_auto=".2f",
-            aspect="auto"
-        )
+        if fig_corr is not None:
+            st.plotly_chart(fig_corr, use_container_width=True)
+        else:
+            st.warning("Variables sin variación con los filtros actuales.")
 
-        st.plotly_chart(fig_corr, use_container_width=True)
-    else:
-        st.warning("Variables sin variación con los filtros actuales.")
+heatmap_section(region_key, num_cols)
 
 # ======================
 # SCATTER
 # ======================
 st.subheader("Relación entre variables")
 
-x_var = st.selectbox("Variable X", num_cols, index=0)
-y_var = st.selectbox("Variable Y", num_cols, index=1)
+@st.fragment
+def scatter_section(df_f, num_cols):
+    x_var = st.selectbox("Variable X", num_cols, index=0)
+    y_var = st.selectbox("Variable Y", num_cols, index=1)
+
+    df_s = df_f
+    if len(df_s) > MAX_SCATTER_POINTS:
+        df_s = df_s.sample(MAX_SCATTER_POINTS, random_state=0)
+
+    fig = px.scatter(
+        df_s,
+        x=x_var,
+        y=y_var,
+        hover_name="region",
+        render_mode="webgl"
+    )
 
-fig = px.scatter(
-    df_f,
-    x=x_var,
-    y=y_var,
-    hover_name="region"
-)
+    st.plotly_chart(fig, use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+scatter_section(df_f, num_cols)
 
 # ======================
 # CONCLUSIONES